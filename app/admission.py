@@ -0,0 +1,208 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import jsonify, request
+from prometheus_client import Counter, Gauge, Histogram
+
+# ----------------------
+# CONFIGURATIONS
+# ----------------------
+# Limits apply per worker process; gunicorn.conf.py runs a single worker
+# with enough threads for MAX_IN_FLIGHT + MAX_QUEUE requests to reach
+# Flask, and Elastic Beanstalk scales out on the exported metrics rather
+# than letting the queues grow.
+MAX_IN_FLIGHT = int(os.environ.get("MAX_IN_FLIGHT", 8))
+MAX_QUEUE = int(os.environ.get("MAX_QUEUE", 16))
+QUEUE_TIMEOUT_SECONDS = float(os.environ.get("QUEUE_TIMEOUT_SECONDS", 0.5))
+RETRY_AFTER_SECONDS = int(os.environ.get("RETRY_AFTER_SECONDS", 1))
+
+# Batch requests take one in-flight slot per INSTANCES_PER_SLOT instances
+INSTANCES_PER_SLOT = int(os.environ.get("INSTANCES_PER_SLOT", 25))
+
+# Per-client token bucket, charged one token per predicted instance;
+# disabled when RATE_LIMIT_PER_SECOND is 0
+RATE_LIMIT_PER_SECOND = float(os.environ.get("RATE_LIMIT_PER_SECOND", 0))
+RATE_LIMIT_BURST = int(os.environ.get("RATE_LIMIT_BURST", 20))
+RATE_LIMIT_MAX_CLIENTS = 10000
+
+# Comma-separated API keys that get their own rate limit bucket; callers
+# with a missing or unknown X-API-Key are limited by client IP
+API_KEYS = frozenset(
+    key.strip() for key in os.environ.get("API_KEYS", "").split(",")
+    if key.strip())
+
+# ----------------------
+# PROMETHEUS METRICS
+# ----------------------
+IN_FLIGHT = Gauge(
+    "admission_in_flight_requests", "Requests currently being processed")
+QUEUE_DEPTH = Gauge(
+    "admission_queue_depth", "Requests waiting for a processing slot")
+SHED_TOTAL = Counter(
+    "admission_shed_total", "Requests rejected before processing",
+    ["reason"])
+QUEUE_WAIT = Histogram(
+    "admission_queue_wait_seconds", "Time admitted requests spent queued")
+ADMITTED_LATENCY = Histogram(
+    "admission_admitted_latency_seconds",
+    "Latency of admitted requests, including queue wait")
+
+
+class TokenBucketLimiter:
+    """
+    Per-client token bucket. Each client gets `burst` tokens that refill at
+    `rate` tokens per second; the least recently seen clients are evicted
+    once more than `max_clients` are tracked.
+    """
+
+    def __init__(self, rate, burst, max_clients=RATE_LIMIT_MAX_CLIENTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key, cost=1):
+        """
+        Take `cost` tokens for `key`. Returns 0 on success, otherwise the
+        number of seconds until enough tokens are available. A request
+        costing more than `burst` is admitted from a full bucket and leaves
+        it in debt, so its full cost is still charged.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            needed = min(cost, self.burst)
+            wait = 0.0
+            if tokens >= needed:
+                tokens -= cost
+            else:
+                wait = (needed - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class AdmissionController:
+    """
+    Bounds the work processed concurrently to `max_in_flight` slots; a
+    request may take several slots (capped at `max_in_flight`). Requests
+    that do not fit wait in a queue of at most `max_queue` entries for up
+    to `queue_timeout` seconds; anything else is shed immediately.
+    """
+
+    def __init__(self, max_in_flight, max_queue, queue_timeout):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._available = max_in_flight
+        self._cond = threading.Condition()
+        self._waiting = 0
+
+    def acquire(self, slots=1):
+        """
+        Try to take `slots` processing slots. Returns None when admitted,
+        otherwise the reason the request was shed ("queue_full" or
+        "queue_timeout").
+        """
+        slots = min(slots, self.max_in_flight)
+        with self._cond:
+            if self._available >= slots:
+                self._available -= slots
+                QUEUE_WAIT.observe(0)
+                return None
+            if self._waiting >= self.max_queue:
+                return "queue_full"
+
+            self._waiting += 1
+            QUEUE_DEPTH.set(self._waiting)
+            start = time.perf_counter()
+            try:
+                admitted = self._cond.wait_for(
+                    lambda: self._available >= slots, self.queue_timeout)
+            finally:
+                self._waiting -= 1
+                QUEUE_DEPTH.set(self._waiting)
+
+            if not admitted:
+                return "queue_timeout"
+            self._available -= slots
+        QUEUE_WAIT.observe(time.perf_counter() - start)
+        return None
+
+    def release(self, slots=1):
+        with self._cond:
+            self._available += min(slots, self.max_in_flight)
+            self._cond.notify_all()
+
+
+admission_controller = AdmissionController(
+    MAX_IN_FLIGHT, MAX_QUEUE, QUEUE_TIMEOUT_SECONDS)
+rate_limiter = None
+if RATE_LIMIT_PER_SECOND > 0:
+    rate_limiter = TokenBucketLimiter(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+
+
+def client_key():
+    """
+    Identify the caller by a configured API key, falling back to the client
+    IP. remote_addr is resolved from the trusted proxy hops by ProxyFix in
+    application.py, so a client-supplied X-Forwarded-For cannot change it.
+    """
+    api_key = request.headers.get("X-API-Key")
+    if api_key in API_KEYS:
+        return f"key:{api_key}"
+    return f"ip:{request.remote_addr}"
+
+
+def reject(status, reason, message, retry_after):
+    SHED_TOTAL.labels(reason=reason).inc()
+    response = jsonify({"error": message})
+    response.status_code = status
+    response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def admission_control(view=None, cost=None):
+    """
+    Decorator applying rate limiting and admission control to a Flask view.
+    Rate-limited callers get a 429, over-capacity requests get a 503; both
+    carry a Retry-After header.
+
+    `cost` is an optional callable returning how many instances the current
+    request predicts (default 1). Each instance costs one rate-limit token,
+    and every INSTANCES_PER_SLOT instances take one in-flight slot.
+    """
+    if view is None:
+        return lambda view: admission_control(view, cost=cost)
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        instances = max(1, cost()) if cost is not None else 1
+        if rate_limiter is not None:
+            wait = rate_limiter.acquire(client_key(), instances)
+            if wait:
+                return reject(429, "rate_limited", "Rate limit exceeded", wait)
+
+        slots = math.ceil(instances / INSTANCES_PER_SLOT)
+        start = time.perf_counter()
+        reason = admission_controller.acquire(slots)
+        if reason is not None:
+            return reject(503, reason, "Server is over capacity, retry later",
+                          RETRY_AFTER_SECONDS)
+
+        IN_FLIGHT.inc()
+        try:
+            return view(*args, **kwargs)
+        finally:
+            IN_FLIGHT.dec()
+            admission_controller.release(slots)
+            ADMITTED_LATENCY.observe(time.perf_counter() - start)
+
+    return wrapper
@@ -1,9 +1,11 @@
 # flake8: noqa
 import os
 import json
+import re
 import boto3
 import numpy as np
 from flask import Flask, request, jsonify
+from werkzeug.middleware.proxy_fix import ProxyFix
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 from prometheus_flask_exporter import PrometheusMetrics
 from dotenv import load_dotenv
@@ -11,9 +13,20 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Imported after load_dotenv so admission limits can come from .env
+from admission import admission_control
+from validation import housing_validator
+
 app = Flask(__name__)
 application = app
 
+# Number of proxies that append to X-Forwarded-For in front of the app.
+# On Elastic Beanstalk both the load balancer and nginx do, so the real
+# client address is the second entry from the right; anything further
+# left is client-controlled and ignored.
+TRUSTED_PROXY_HOPS = int(os.environ.get("TRUSTED_PROXY_HOPS", 2))
+app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_HOPS)
+
 # /metrics endpoint
 @app.route('/metrics', methods=['GET'])
 def metrics_endpoint():
@@ -26,26 +39,27 @@ metrics = PrometheusMetrics(app)
 SM_ENDPOINT_NAME = os.environ.get("SM_ENDPOINT_NAME")
 AWS_REGION = os.environ.get("AWS_REGION")
 
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", 100))
+
 @app.route('/', methods=['GET'])
 def health_check():
     return jsonify({"message": "Housing Prediction API is up!"})
 
 @app.route('/predict', methods=['POST'])
+@admission_control
 def predict():
     data = request.get_json()
     if not data:
         return jsonify({"error": "No JSON body provided"}), 400
 
-    try:
-        bedrooms = data["bedrooms"]
-        bathrooms = data["bathrooms"]
-        lot_size = data["lot_size"]
-        house_size = data["house_size"]
-    except KeyError as e:
-        return jsonify({"error": f"Missing field {str(e)}"}), 400
+    # Reject bad input locally instead of spending a SageMaker round trip
+    features, errors = housing_validator.validate([data], route="predict")
+    if errors:
+        fields = {e["field"]: e["message"] for e in errors}
+        summary = "; ".join(f"{field} {message}" for field, message in fields.items())
+        return jsonify({"error": f"Invalid input: {summary}", "fields": fields}), 400
 
-    features = [bedrooms, bathrooms, lot_size, house_size]
-    csv_payload = ",".join(str(x) for x in features)
+    csv_payload = housing_validator.to_csv(features)
 
     sagemaker_runtime = boto3.client("sagemaker-runtime", region_name=AWS_REGION)
     try:
@@ -76,6 +90,75 @@ def predict():
             "error": f"SageMaker invocation failed: {str(e)}"
         }), 500
 
+def parse_predictions(body):
+    """
+    Parse a multi-row SageMaker response (JSON, or CSV/newline-separated
+    values) into a list of floats.
+    """
+    try:
+        result = json.loads(body)
+    except ValueError:
+        return [float(x) for x in re.split(r"[,\s]+", body.strip()) if x]
+
+    if isinstance(result, dict):
+        result = result.get("predictions", list(result.values())[0])
+    if not isinstance(result, list):
+        result = [result]
+    return [float(p["score"]) if isinstance(p, dict) else float(p) for p in result]
+
+def batch_cost():
+    """
+    Number of instances in a /predict/batch request, used to charge
+    admission control per instance rather than per request.
+    """
+    data = request.get_json(silent=True)
+    instances = data.get("instances") if isinstance(data, dict) else None
+    if not isinstance(instances, list):
+        return 1
+    return min(len(instances), MAX_BATCH_SIZE)
+
+@app.route('/predict/batch', methods=['POST'])
+@admission_control(cost=batch_cost)
+def predict_batch():
+    data = request.get_json()
+    if not data:
+        return jsonify({"error": "No JSON body provided"}), 400
+
+    instances = data.get("instances") if isinstance(data, dict) else None
+    if not isinstance(instances, list) or not instances:
+        return jsonify({"error": "Expected a non-empty 'instances' list"}), 400
+    if len(instances) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"Batch size exceeds {MAX_BATCH_SIZE} instances"}), 413
+
+    features, errors = housing_validator.validate(instances, route="predict_batch")
+    if errors:
+        return jsonify({
+            "error": f"Invalid input in {len({e['index'] for e in errors})} instance(s)",
+            "errors": errors
+        }), 400
+
+    csv_payload = housing_validator.to_csv(features)
+
+    sagemaker_runtime = boto3.client("sagemaker-runtime", region_name=AWS_REGION)
+    try:
+        response = sagemaker_runtime.invoke_endpoint(
+            EndpointName=SM_ENDPOINT_NAME,
+            Body=csv_payload,
+            ContentType="text/csv"
+        )
+        predictions = parse_predictions(response['Body'].read().decode("utf-8"))
+    except Exception as e:
+        return jsonify({
+            "error": f"SageMaker invocation failed: {str(e)}"
+        }), 500
+
+    if len(predictions) != len(features):
+        return jsonify({
+            "error": f"Expected {len(features)} predictions, got {len(predictions)}"
+        }), 500
+
+    return jsonify({"predictions": [float(np.expm1(p)) for p in predictions]})
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
     app.run(host='0.0.0.0', port=port, debug=True)
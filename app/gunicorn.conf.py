@@ -0,0 +1,23 @@
+# Gunicorn settings for Elastic Beanstalk (see Procfile)
+import os
+import sys
+
+from dotenv import load_dotenv
+
+load_dotenv()
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from admission import MAX_IN_FLIGHT, MAX_QUEUE  # noqa: E402
+
+bind = "0.0.0.0:" + os.environ.get("PORT", "8000")
+
+# Admission limits and Prometheus metrics live in process memory, so run
+# a single worker per instance and scale out with more instances.
+workers = 1
+worker_class = "gthread"
+
+# Enough threads for every admitted and queued request to reach Flask,
+# where they are counted and shed, plus spare threads so the health
+# check and /metrics still answer when the queue is full.
+SPARE_THREADS = 4
+threads = MAX_IN_FLIGHT + MAX_QUEUE + SPARE_THREADS
@@ -0,0 +1,42 @@
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import application  # noqa: E402
+
+
+class StubSageMakerRuntime:
+    """
+    Stands in for the sagemaker-runtime client, returning 1.0 per CSV row.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke_endpoint(self, EndpointName, Body, ContentType):
+        self.calls += 1
+        body = "\n".join("1.0" for _ in Body.split("\n"))
+        return {"Body": io.BytesIO(body.encode("utf-8"))}
+
+
+@pytest.fixture
+def sagemaker(monkeypatch):
+    stub = StubSageMakerRuntime()
+    monkeypatch.setattr(application.boto3, "client",
+                        lambda *args, **kwargs: stub)
+    return stub
+
+
+@pytest.fixture
+def client(sagemaker):
+    return application.app.test_client()
+
+
+@pytest.fixture
+def house():
+    return {"bedrooms": 3, "bathrooms": 1, "lot_size": 1.0,
+            "house_size": 1500}
@@ -0,0 +1,174 @@
+import threading
+import time
+
+import admission
+import pytest
+from admission import (AdmissionController, TokenBucketLimiter,
+                       admission_control, client_key)
+from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+
+def wait_until(condition, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.001)
+
+
+def test_queue_full_when_queue_is_full():
+    controller = AdmissionController(1, 1, queue_timeout=1.0)
+    assert controller.acquire() is None
+
+    queued = []
+    waiter = threading.Thread(
+        target=lambda: queued.append(controller.acquire()))
+    waiter.start()
+    wait_until(lambda: controller._waiting == 1)
+
+    assert controller.acquire() == "queue_full"
+
+    controller.release()
+    waiter.join()
+    assert queued == [None]
+
+
+def test_queue_timeout_after_deadline():
+    controller = AdmissionController(1, 1, queue_timeout=0.05)
+    assert controller.acquire() is None
+
+    start = time.perf_counter()
+    assert controller.acquire() == "queue_timeout"
+    assert time.perf_counter() - start >= 0.05
+    assert controller._waiting == 0
+
+
+@pytest.fixture
+def limited_app(monkeypatch):
+    """
+    A minimal app with the production ProxyFix setting and one slot, no
+    queue and a 2-token bucket.
+    """
+    monkeypatch.setattr(admission, "admission_controller",
+                        AdmissionController(1, 0, queue_timeout=0.01))
+    monkeypatch.setattr(admission, "rate_limiter",
+                        TokenBucketLimiter(rate=0.5, burst=2))
+    monkeypatch.setattr(admission, "API_KEYS", frozenset({"known-key"}))
+
+    app = Flask(__name__)
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=2)
+
+    @app.route("/ok")
+    @admission_control
+    def ok():
+        return "ok"
+
+    @app.route("/boom")
+    @admission_control
+    def boom():
+        raise RuntimeError("view failed")
+
+    @app.route("/key")
+    def key():
+        return client_key()
+
+    return app.test_client()
+
+
+def test_slot_released_when_view_raises(limited_app):
+    assert limited_app.get("/boom").status_code == 500
+    assert admission.IN_FLIGHT._value.get() == 0
+    assert limited_app.get("/ok").status_code == 200
+
+
+def test_rate_limited_with_retry_after(limited_app):
+    statuses = [limited_app.get("/ok").status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+
+    response = limited_app.get("/ok")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) == 2
+
+
+def test_client_key_ignores_spoofed_forwarded_for(limited_app):
+    # Load balancer and nginx append the real client and the ELB address
+    for spoofed in ("9.9.9.1", "9.9.9.2"):
+        response = limited_app.get("/key", headers={
+            "X-Forwarded-For": f"{spoofed}, 1.2.3.4, 172.31.0.9"})
+        assert response.get_data(as_text=True) == "ip:1.2.3.4"
+
+    response = limited_app.get("/key", headers={"X-Forwarded-For": "9.9.9.3"},
+                               environ_base={"REMOTE_ADDR": "10.0.0.5"})
+    assert response.get_data(as_text=True) == "ip:10.0.0.5"
+
+
+def test_client_key_honors_only_known_api_keys(limited_app):
+    headers = {"X-Forwarded-For": "1.2.3.4, 172.31.0.9"}
+    unknown = limited_app.get("/key", headers=dict(headers, **{
+        "X-API-Key": "made-up"}))
+    known = limited_app.get("/key", headers=dict(headers, **{
+        "X-API-Key": "known-key"}))
+    assert unknown.get_data(as_text=True) == "ip:1.2.3.4"
+    assert known.get_data(as_text=True) == "key:known-key"
+
+
+def test_predict_rate_limit_survives_rotating_headers(client, house,
+                                                      monkeypatch):
+    monkeypatch.setattr(admission, "rate_limiter",
+                        TokenBucketLimiter(rate=0.01, burst=2))
+    statuses = [
+        client.post("/predict", json=house, headers={
+            "X-Forwarded-For": f"9.9.9.{n}, 1.2.3.4, 172.31.0.9",
+            "X-API-Key": f"random-{n}",
+        }).status_code
+        for n in range(3)
+    ]
+    assert statuses == [200, 200, 429]
+
+
+def test_token_bucket_charges_cost():
+    limiter = TokenBucketLimiter(rate=1, burst=10)
+    assert limiter.acquire("client", 4) == 0
+    assert limiter.acquire("client", 4) == 0
+    assert limiter.acquire("client", 4) == pytest.approx(2, abs=0.01)
+
+
+def test_token_bucket_charges_full_cost_above_burst():
+    limiter = TokenBucketLimiter(rate=1, burst=10)
+    assert limiter.acquire("client", 25) == 0
+    # 15 tokens of debt must be repaid before the next token
+    assert limiter.acquire("client") == pytest.approx(16, abs=0.01)
+
+
+def test_weighted_slots():
+    controller = AdmissionController(4, 0, queue_timeout=0.01)
+    assert controller.acquire(3) is None
+    assert controller.acquire(2) == "queue_full"
+    assert controller.acquire(1) is None
+    controller.release(3)
+    controller.release(1)
+    # Requests larger than the whole pool take every slot
+    assert controller.acquire(10) is None
+    assert controller.acquire(1) == "queue_full"
+
+
+def test_batch_charged_per_instance(client, house, monkeypatch):
+    monkeypatch.setattr(admission, "rate_limiter",
+                        TokenBucketLimiter(rate=0.01, burst=5))
+    batch = {"instances": [house] * 3}
+    assert client.post("/predict/batch", json=batch).status_code == 200
+    assert client.post("/predict/batch", json=batch).status_code == 429
+    assert client.post("/predict", json=house).status_code == 200
+
+
+def test_batch_takes_slots_by_size(client, house, monkeypatch):
+    monkeypatch.setattr(admission, "INSTANCES_PER_SLOT", 2)
+    controller = AdmissionController(4, 0, queue_timeout=0.01)
+    monkeypatch.setattr(admission, "admission_controller", controller)
+    assert controller.acquire(2) is None
+
+    # 5 instances need 3 slots but only 2 are free
+    response = client.post("/predict/batch", json={"instances": [house] * 5})
+    assert response.status_code == 503
+    response = client.post("/predict/batch", json={"instances": [house] * 4})
+    assert response.status_code == 200
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from validation import FEATURE_RANGES, SchemaValidator
+
+
+@pytest.fixture
+def validator():
+    return SchemaValidator(FEATURE_RANGES)
+
+
+def errors_for(validator, instances):
+    features, errors = validator.validate(instances)
+    assert features is None
+    return [(e["index"], e["field"], e["message"]) for e in errors]
+
+
+def test_coerces_numeric_strings(validator, house):
+    instance = dict(house, bedrooms="3", bathrooms=" 2.5 ", lot_size="1e-1")
+    features, errors = validator.validate([instance])
+    assert errors == []
+    assert features.dtype == np.float64
+    assert features.tolist() == [[3.0, 2.5, 0.1, 1500.0]]
+
+
+@pytest.mark.parametrize("value", [None, True, False, [1], {"a": 1}, "abc",
+                                   10 ** 400])
+def test_rejects_non_numbers(validator, house, value):
+    assert errors_for(validator, [dict(house, lot_size=value)]) == [
+        (0, "lot_size", "must be a number")]
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), "nan", "-inf",
+                                   "1e400"])
+def test_rejects_non_finite(validator, house, value):
+    assert errors_for(validator, [dict(house, house_size=value)]) == [
+        (0, "house_size", "must be a finite number")]
+
+
+@pytest.mark.parametrize("field, value", [("bedrooms", -1), ("bedrooms", 21),
+                                          ("house_size", 100001)])
+def test_rejects_out_of_range(validator, house, field, value):
+    low, high = FEATURE_RANGES[field]
+    assert errors_for(validator, [dict(house, **{field: value})]) == [
+        (0, field, f"must be between {low:g} and {high:g}")]
+
+
+def test_accepts_range_bounds(validator, house):
+    instance = dict(house, bedrooms=0, bathrooms=20)
+    assert validator.validate([instance])[1] == []
+
+
+def test_non_object_instance_reported_once(validator):
+    assert errors_for(validator, [5]) == [
+        (0, "instance", "must be a JSON object")]
+
+
+def test_missing_fields(validator, house):
+    assert errors_for(validator, [{"bedrooms": 3}]) == [
+        (0, "bathrooms", "is required"),
+        (0, "lot_size", "is required"),
+        (0, "house_size", "is required"),
+    ]
+
+
+def test_batch_error_indexes(validator, house):
+    instances = [house, dict(house, bedrooms="x"), house, [house],
+                 dict(house, lot_size=-2)]
+    assert errors_for(validator, instances) == [
+        (1, "bedrooms", "must be a number"),
+        (3, "instance", "must be a JSON object"),
+        (4, "lot_size", "must be between 0 and 100000"),
+    ]
+
+
+def test_to_csv(validator, house):
+    instances = [house,
+                 {"bedrooms": 2, "bathrooms": "2.5", "lot_size": 0.25,
+                  "house_size": 900},
+                 {"bedrooms": 1, "bathrooms": 1, "lot_size": 1e-05,
+                  "house_size": 12345.678}]
+    features, errors = validator.validate(instances)
+    assert errors == []
+    assert validator.to_csv(features) == (
+        "3.0,1.0,1.0,1500.0\n"
+        "2.0,2.5,0.25,900.0\n"
+        "1.0,1.0,1e-05,12345.678"
+    )
@@ -0,0 +1,158 @@
+import time
+
+import numpy as np
+from prometheus_client import Counter, Histogram
+
+# ----------------------
+# CONFIGURATIONS
+# ----------------------
+# Accepted (inclusive) range for each model feature, in payload order
+FEATURE_RANGES = {
+    "bedrooms": (0, 20),
+    "bathrooms": (0, 20),
+    "lot_size": (0, 100000),
+    "house_size": (0, 100000),
+}
+
+# ----------------------
+# PROMETHEUS METRICS
+# ----------------------
+VALIDATION_SECONDS = Histogram(
+    "validation_seconds", "Time spent validating prediction inputs",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1))
+REJECTED_REQUESTS = Counter(
+    "validation_rejected_requests_total",
+    "Prediction requests rejected locally by input validation", ["route"])
+REJECTED_FIELDS = Counter(
+    "validation_rejected_fields_total",
+    "Invalid input fields rejected locally", ["field", "reason"])
+
+NUMERIC_TYPES = (int, float)
+
+
+class SchemaValidator:
+    """
+    Validates and coerces prediction inputs into a float array.
+
+    The field order and bounds are compiled into NumPy arrays once, so a
+    batch is range-checked with a handful of vectorized operations rather
+    than per-value Python checks.
+    """
+
+    def __init__(self, ranges):
+        self.fields = list(ranges)
+        self.lower = np.array([lo for lo, _ in ranges.values()], dtype=float)
+        self.upper = np.array([hi for _, hi in ranges.values()], dtype=float)
+        self.row_format = ",".join(["%r"] * len(self.fields))
+
+    def validate(self, instances, route="predict"):
+        """
+        Coerce a list of instance dicts into an (n, len(fields)) float array.
+        Returns (features, errors); errors is a list of
+        {"index", "field", "message"} dicts and features is None when any
+        instance is invalid.
+        """
+        start = time.perf_counter()
+        features, invalid = self._coerce(instances)
+        errors = self._collect_errors(instances, features, invalid)
+        VALIDATION_SECONDS.observe(time.perf_counter() - start)
+
+        if errors:
+            REJECTED_REQUESTS.labels(route=route).inc()
+            return None, errors
+        return features, []
+
+    def _coerce(self, instances):
+        """
+        Build the float array column by column. Columns holding only ints
+        and floats take the fast path; anything else is coerced per value,
+        with unparseable values recorded in the `invalid` mask.
+        """
+        n = len(instances)
+        features = np.empty((n, len(self.fields)), dtype=float)
+        invalid = np.zeros((n, len(self.fields)), dtype=bool)
+        rows = [row if isinstance(row, dict) else {} for row in instances]
+
+        for j, field in enumerate(self.fields):
+            column = [row.get(field) for row in rows]
+            types = set(map(type, column))
+            if types.issubset(NUMERIC_TYPES):
+                try:
+                    features[:, j] = column
+                    continue
+                except OverflowError:
+                    pass  # An int too large for a float; flag it below
+            for i, value in enumerate(column):
+                coerced = coerce_value(value)
+                if coerced is None:
+                    invalid[i, j] = True
+                    features[i, j] = np.nan
+                else:
+                    features[i, j] = coerced
+        return features, invalid
+
+    def _collect_errors(self, instances, features, invalid):
+        with np.errstate(invalid="ignore"):
+            nonfinite = ~invalid & ~np.isfinite(features)
+            out_of_range = (
+                ~invalid & ~nonfinite
+                & ((features < self.lower) | (features > self.upper))
+            )
+        if not (invalid.any() or nonfinite.any() or out_of_range.any()):
+            return []
+
+        errors = []
+        for i, j in zip(*np.nonzero(invalid | nonfinite | out_of_range)):
+            field = self.fields[j]
+            if not isinstance(instances[i], dict):
+                # Report a non-object instance once, not once per field
+                if j:
+                    continue
+                field = "instance"
+                reason, message = "type", "must be a JSON object"
+            elif field not in instances[i]:
+                reason, message = "missing", "is required"
+            elif invalid[i, j]:
+                reason, message = "type", "must be a number"
+            elif nonfinite[i, j]:
+                reason, message = "nonfinite", "must be a finite number"
+            else:
+                reason = "range"
+                message = (f"must be between {self.lower[j]:g} "
+                           f"and {self.upper[j]:g}")
+            REJECTED_FIELDS.labels(field=field, reason=reason).inc()
+            errors.append({"index": int(i), "field": field,
+                           "message": message})
+        return errors
+
+    def to_csv(self, features):
+        """
+        Format a validated float array as a text/csv SageMaker payload,
+        one row per line.
+        """
+        rows = "\n".join([self.row_format] * len(features))
+        return rows % tuple(features.ravel().tolist())
+
+
+def coerce_value(value):
+    """
+    Convert a single JSON value to float, accepting numbers and numeric
+    strings. Returns None for anything else (null, bool, objects, lists,
+    ints too large for a float).
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, NUMERIC_TYPES):
+        try:
+            return float(value)
+        except OverflowError:
+            return None
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+housing_validator = SchemaValidator(FEATURE_RANGES)
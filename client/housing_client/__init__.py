@@ -0,0 +1,4 @@
+from .client import HousingAPIError, HousingClient
+from .aio import AsyncHousingClient
+
+__all__ = ["AsyncHousingClient", "HousingAPIError", "HousingClient"]
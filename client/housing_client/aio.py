@@ -0,0 +1,161 @@
+import asyncio
+import time
+from collections import deque
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from .client import (
+    BATCH_ROUTE, DEFAULT_BACKOFF, DEFAULT_BATCH_SIZE, DEFAULT_MAX_BACKOFF,
+    DEFAULT_MAX_CONCURRENCY, DEFAULT_MAX_RETRIES, DEFAULT_TIMEOUT,
+    NO_BATCH_STATUSES, PREDICT_ROUTE, RETRY_STATUSES, HousingAPIError,
+    chunked, error_message, retry_delay,
+)
+
+
+async def achunked(houses, size):
+    """
+    Split a sync or async iterable into lists of at most `size` items.
+    """
+    if not hasattr(houses, "__aiter__"):
+        for chunk in chunked(houses, size):
+            yield chunk
+        return
+
+    chunk = []
+    async for house in houses:
+        chunk.append(house)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class AsyncHousingClient:
+    """
+    asyncio counterpart of HousingClient, built on aiohttp.
+
+    Must be used from a running event loop, ideally as
+    `async with AsyncHousingClient(...) as client:`. `max_concurrency`
+    bounds both the connection pool and the number of requests in flight.
+    """
+
+    def __init__(self, base_url, api_key=None, timeout=DEFAULT_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff=DEFAULT_BACKOFF,
+                 max_backoff=DEFAULT_MAX_BACKOFF, batch_size=DEFAULT_BATCH_SIZE,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, on_latency=None):
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncHousingClient requires aiohttp; install housing-client[async]"
+            )
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.on_latency = on_latency
+        self._batch_supported = None  # Unknown until the first batch call
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        headers = {"X-API-Key": api_key} if api_key else None
+        self.session = aiohttp.ClientSession(
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            connector=aiohttp.TCPConnector(limit=max_concurrency),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self.session.close()
+
+    async def _post(self, route, payload):
+        """
+        POST `payload` to `route`, retrying transient failures. Returns
+        (status_code, parsed JSON body) of the final attempt.
+        """
+        url = self.base_url + route
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                async with self._semaphore:
+                    async with self.session.post(url, json=payload) as response:
+                        status_code = response.status
+                        retry_after = response.headers.get("Retry-After")
+                        try:
+                            body = await response.json(content_type=None)
+                        except ValueError:
+                            body = None
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self._record_latency(route, start, None)
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(retry_delay(attempt, None, self.backoff, self.max_backoff))
+                continue
+
+            self._record_latency(route, start, status_code)
+            if status_code in RETRY_STATUSES and attempt < self.max_retries:
+                await asyncio.sleep(
+                    retry_delay(attempt, retry_after, self.backoff, self.max_backoff)
+                )
+                continue
+            return status_code, body
+
+    def _record_latency(self, route, start, status_code):
+        if self.on_latency is not None:
+            self.on_latency(route, time.perf_counter() - start, status_code)
+
+    async def predict(self, house):
+        """
+        Predict the price of a single house, given a dict with bedrooms,
+        bathrooms, lot_size and house_size.
+        """
+        status_code, body = await self._post(PREDICT_ROUTE, house)
+        if status_code != 200:
+            raise HousingAPIError(status_code, error_message(status_code, body))
+        return body["prediction"]
+
+    async def predict_batch(self, houses):
+        """
+        Predict prices for a list of houses in one call to the batch route,
+        falling back to one request per house if the server has no batch
+        route.
+        """
+        houses = list(houses)
+        if self._batch_supported is not False:
+            status_code, body = await self._post(BATCH_ROUTE, {"instances": houses})
+            if status_code == 200:
+                self._batch_supported = True
+                return body["predictions"]
+            if status_code not in NO_BATCH_STATUSES or self._batch_supported:
+                raise HousingAPIError(status_code, error_message(status_code, body))
+            self._batch_supported = False
+        return await asyncio.gather(*(self.predict(house) for house in houses))
+
+    async def predict_many(self, houses, batch_size=None):
+        """
+        Stream predictions for a sync or async iterable of houses, yielded in
+        input order. At most `max_concurrency` batches are in flight.
+        """
+        batch_size = batch_size or self.batch_size
+        pending = deque()
+        try:
+            async for chunk in achunked(houses, batch_size):
+                pending.append(asyncio.ensure_future(self.predict_batch(chunk)))
+                if len(pending) >= self.max_concurrency:
+                    for prediction in await pending.popleft():
+                        yield prediction
+            while pending:
+                for prediction in await pending.popleft():
+                    yield prediction
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,201 @@
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from itertools import islice
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# ----------------------
+# CONFIGURATIONS
+# ----------------------
+PREDICT_ROUTE = "/predict"
+BATCH_ROUTE = "/predict/batch"
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 10.0
+DEFAULT_BATCH_SIZE = 50       # Must not exceed the server's MAX_BATCH_SIZE
+DEFAULT_MAX_CONCURRENCY = 8
+
+RETRY_STATUSES = {429, 502, 503, 504}
+NO_BATCH_STATUSES = {404, 405}
+
+
+class HousingAPIError(Exception):
+    """
+    Raised when the API returns an error response that is not retried
+    (or is still failing after all retries).
+    """
+
+    def __init__(self, status_code, message):
+        super().__init__(f"{status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+
+
+def retry_delay(attempt, retry_after=None, backoff=DEFAULT_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF):
+    """
+    Seconds to wait before retry number `attempt` (0-based). A Retry-After
+    header (seconds or HTTP date) takes precedence over exponential backoff
+    with jitter; either way the delay is capped at `max_backoff`.
+    """
+    if retry_after:
+        try:
+            return min(max_backoff, max(0.0, float(retry_after)))
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                return min(max_backoff, max(0.0, delay))
+            except (TypeError, ValueError):
+                pass
+    return min(max_backoff, backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+def error_message(status_code, body):
+    if isinstance(body, dict) and "error" in body:
+        return body["error"]
+    return f"Unexpected response (HTTP {status_code})"
+
+
+def chunked(iterable, size):
+    """
+    Lazily split `iterable` into lists of at most `size` items.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class HousingClient:
+    """
+    Thread-safe client for the housing prediction API.
+
+    Reuses pooled keep-alive connections, retries 429/5xx responses and
+    connection errors with backoff (honoring Retry-After), and sends
+    `predict_many` traffic through the batch route when the server has one.
+
+    At most `max_concurrency` requests are in flight at once, whether they
+    come from `predict_many` or from `predict` called on many threads;
+    further calls block until a pooled connection is free.
+
+    `on_latency(route, seconds, status_code)` is called after every HTTP
+    attempt, including retries; `status_code` is None when the request
+    failed before a response was received.
+    """
+
+    def __init__(self, base_url, api_key=None, timeout=DEFAULT_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff=DEFAULT_BACKOFF,
+                 max_backoff=DEFAULT_MAX_BACKOFF, batch_size=DEFAULT_BATCH_SIZE,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, on_latency=None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.on_latency = on_latency
+        self._batch_supported = None  # Unknown until the first batch call
+
+        self.session = requests.Session()
+        # pool_block bounds concurrency and keeps every connection alive,
+        # rather than opening and discarding extra ones under load
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency,
+                              pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if api_key:
+            self.session.headers["X-API-Key"] = api_key
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def _post(self, route, payload):
+        """
+        POST `payload` to `route`, retrying transient failures. Returns
+        (status_code, parsed JSON body) of the final attempt.
+        """
+        url = self.base_url + route
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                response = self.session.post(url, json=payload, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record_latency(route, start, None)
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(retry_delay(attempt, None, self.backoff, self.max_backoff))
+                continue
+
+            self._record_latency(route, start, response.status_code)
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                delay = retry_delay(attempt, response.headers.get("Retry-After"),
+                                    self.backoff, self.max_backoff)
+                time.sleep(delay)
+                continue
+
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            return response.status_code, body
+
+    def _record_latency(self, route, start, status_code):
+        if self.on_latency is not None:
+            self.on_latency(route, time.perf_counter() - start, status_code)
+
+    def predict(self, house):
+        """
+        Predict the price of a single house, given a dict with bedrooms,
+        bathrooms, lot_size and house_size.
+        """
+        status_code, body = self._post(PREDICT_ROUTE, house)
+        if status_code != 200:
+            raise HousingAPIError(status_code, error_message(status_code, body))
+        return body["prediction"]
+
+    def predict_batch(self, houses):
+        """
+        Predict prices for a list of houses in one call to the batch route,
+        falling back to one request per house if the server has no batch
+        route.
+        """
+        houses = list(houses)
+        if self._batch_supported is not False:
+            status_code, body = self._post(BATCH_ROUTE, {"instances": houses})
+            if status_code == 200:
+                self._batch_supported = True
+                return body["predictions"]
+            if status_code not in NO_BATCH_STATUSES or self._batch_supported:
+                raise HousingAPIError(status_code, error_message(status_code, body))
+            self._batch_supported = False
+        return [self.predict(house) for house in houses]
+
+    def predict_many(self, houses, batch_size=None):
+        """
+        Stream predictions for an iterable of houses, yielded in input order.
+        Houses are read lazily and sent in batches with at most
+        `max_concurrency` batches in flight.
+        """
+        batch_size = batch_size or self.batch_size
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            pending = deque()
+            for chunk in chunked(houses, batch_size):
+                pending.append(pool.submit(self.predict_batch, chunk))
+                if len(pending) >= self.max_concurrency:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
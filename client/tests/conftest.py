@@ -0,0 +1,44 @@
+import io
+import os
+import sys
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path[:0] = [os.path.join(ROOT, "app"), os.path.join(ROOT, "client")]
+
+import application  # noqa: E402
+
+
+class StubSageMakerRuntime:
+    """
+    Stands in for the sagemaker-runtime client: predicts log1p(price) as
+    house_size / 1000 for every CSV row, newline-separated.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke_endpoint(self, EndpointName, Body, ContentType):
+        self.calls += 1
+        rows = Body.split("\n")
+        body = "\n".join(str(float(row.split(",")[3]) / 1000) for row in rows)
+        return {"Body": io.BytesIO(body.encode("utf-8"))}
+
+
+@pytest.fixture(scope="session")
+def server():
+    srv = make_server("127.0.0.1", 0, application.app, threaded=True)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{srv.server_port}"
+    srv.shutdown()
+
+
+@pytest.fixture
+def sagemaker(monkeypatch):
+    stub = StubSageMakerRuntime()
+    monkeypatch.setattr(application.boto3, "client", lambda *args, **kwargs: stub)
+    return stub
@@ -0,0 +1,129 @@
+import asyncio
+import io
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import application
+import pytest
+from housing_client import AsyncHousingClient, HousingAPIError, HousingClient
+from housing_client import client as client_module
+from housing_client.client import retry_delay
+
+
+def house(size):
+    return {"bedrooms": 3, "bathrooms": 1, "lot_size": 1.0, "house_size": size}
+
+
+def expected(size):
+    return math.expm1(size / 1000)
+
+
+HOUSES = [house(1000 + i) for i in range(37)]
+
+
+def test_predict(server, sagemaker):
+    latencies = []
+    with HousingClient(server, on_latency=lambda *args: latencies.append(args)) as client:
+        assert client.predict(house(1500)) == pytest.approx(expected(1500))
+    assert [(route, status) for route, _, status in latencies] == [("/predict", 200)]
+
+
+def test_predict_validation_error(server, sagemaker):
+    with HousingClient(server) as client:
+        with pytest.raises(HousingAPIError) as exc_info:
+            client.predict({"bedrooms": 3})
+    assert exc_info.value.status_code == 400
+    assert sagemaker.calls == 0
+
+
+def test_oversized_int_rejected_locally(server, sagemaker):
+    huge = dict(house(1500), bedrooms=10 ** 400)
+    with HousingClient(server) as client:
+        with pytest.raises(HousingAPIError) as single:
+            client.predict(huge)
+        with pytest.raises(HousingAPIError) as batch:
+            client.predict_batch([house(1500), huge])
+    assert single.value.status_code == batch.value.status_code == 400
+    assert "bedrooms must be a number" in single.value.message
+    assert sagemaker.calls == 0
+
+
+def test_predict_many_keeps_order_across_batches(server, sagemaker):
+    with HousingClient(server, batch_size=5, max_concurrency=4) as client:
+        predictions = list(client.predict_many(iter(HOUSES)))
+    assert predictions == pytest.approx([expected(h["house_size"]) for h in HOUSES])
+    assert sagemaker.calls == 8
+    assert client._batch_supported is True
+
+
+def test_predict_many_falls_back_without_batch_route(server, sagemaker, monkeypatch):
+    monkeypatch.setitem(application.app.view_functions, "predict_batch", lambda: ("", 404))
+    with HousingClient(server, batch_size=4) as client:
+        predictions = list(client.predict_many(HOUSES[:10]))
+    assert predictions == pytest.approx([expected(h["house_size"]) for h in HOUSES[:10]])
+    assert client._batch_supported is False
+    assert sagemaker.calls == 10
+
+
+def test_retries_503_honoring_retry_after(server, sagemaker, monkeypatch):
+    predict_view = application.app.view_functions["predict"]
+    overloaded = iter([True, True])
+
+    def flaky_predict():
+        if next(overloaded, False):
+            return "", 503, {"Retry-After": "0.05"}
+        return predict_view()
+
+    monkeypatch.setitem(application.app.view_functions, "predict", flaky_predict)
+    sleeps = []
+    monkeypatch.setattr(client_module.time, "sleep", sleeps.append)
+
+    statuses = []
+    with HousingClient(server, max_backoff=10,
+                       on_latency=lambda route, seconds, status: statuses.append(status)) as client:
+        assert client.predict(house(1500)) == pytest.approx(expected(1500))
+    assert statuses == [503, 503, 200]
+    # The header's delay is used verbatim, not the exponential backoff
+    assert sleeps == [0.05, 0.05]
+
+
+def test_predict_concurrency_bounded_across_threads(server, monkeypatch):
+    lock = threading.Lock()
+    active = [0, 0]  # current, peak
+
+    class SlowSageMaker:
+        def invoke_endpoint(self, **kwargs):
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return {"Body": io.BytesIO(b"1.0")}
+
+    monkeypatch.setattr(application.boto3, "client", lambda *args, **kwargs: SlowSageMaker())
+    with HousingClient(server, max_concurrency=2) as client:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(client.predict, [house(1500)] * 16))
+    assert len(results) == 16
+    assert active[1] == 2
+
+
+def test_retry_delay_caps_retry_after():
+    assert retry_delay(0, "3600", max_backoff=10) == 10
+    assert retry_delay(0, "Wed, 21 Oct 2099 07:28:00 GMT", max_backoff=10) == 10
+    assert retry_delay(0, "2", max_backoff=10) == 2
+
+
+def test_async_client(server, sagemaker):
+    async def run():
+        async with AsyncHousingClient(server, batch_size=6, max_concurrency=3) as client:
+            single = await client.predict(house(1500))
+            many = [p async for p in client.predict_many(HOUSES)]
+        return single, many
+
+    single, many = asyncio.run(run())
+    assert single == pytest.approx(expected(1500))
+    assert many == pytest.approx([expected(h["house_size"]) for h in HOUSES])
@@ -0,0 +1,236 @@
+import os
+import gc
+import json
+import time
+import sys
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+import preprocess
+
+# ----------------------
+# CONFIGURATIONS
+# ----------------------
+DEFAULT_SIZES = [100_000, 1_000_000, 10_000_000]
+DEFAULT_OUTPUT = "preprocess_benchmark.json"
+DEFAULT_REPEAT = 3
+SEED = 42
+
+STATES = np.array(["California", "Texas", "Florida", "New York", "Illinois", "Ohio", "Georgia", "Washington"])
+CITIES = np.array(["Springfield", "Franklin", "Greenville", "Bristol", "Clinton", "Fairview", "Salem", "Madison"])
+STATUSES = np.array(["for_sale", "sold", "ready_to_build"])
+NULL_RATE = 0.1
+
+# ----------------------
+# SYNTHETIC DATA
+# ----------------------
+def generate_raw_data(num_rows, seed=SEED):
+    """
+    Build a DataFrame matching the raw_housing_data.csv schema with
+    realistic distributions and roughly NULL_RATE missing values in the
+    numeric feature columns.
+    """
+    rng = np.random.default_rng(seed)
+
+    def with_nulls(values):
+        values = values.astype(float)
+        values[rng.random(num_rows) < NULL_RATE] = np.nan
+        return values
+
+    sold_dates = pd.Timestamp("2000-01-01") + pd.to_timedelta(rng.integers(0, 8000, num_rows), unit="D")
+
+    return pd.DataFrame({
+        "brokered_by": rng.integers(1, 110_000, num_rows).astype(float),
+        "status": rng.choice(STATUSES, num_rows),
+        "price": with_nulls(np.round(rng.lognormal(12.8, 0.9, num_rows))),
+        "bed": with_nulls(np.clip(rng.poisson(3, num_rows), 1, 20)),
+        "bath": with_nulls(np.clip(rng.poisson(2, num_rows), 1, 20)),
+        "acre_lot": with_nulls(np.round(rng.lognormal(-1.5, 1.5, num_rows), 2)),
+        "street": rng.integers(1, 2_000_000, num_rows).astype(float),
+        "city": rng.choice(CITIES, num_rows),
+        "state": rng.choice(STATES, num_rows),
+        "zip_code": rng.integers(1000, 99999, num_rows).astype(float),
+        "house_size": with_nulls(np.round(rng.lognormal(7.5, 0.5, num_rows))),
+        "prev_sold_date": sold_dates.strftime("%Y-%m-%d"),
+    })
+
+def write_raw_data(num_rows, directory):
+    path = os.path.join(directory, f"raw_housing_{num_rows}.csv")
+    generate_raw_data(num_rows).to_csv(path, index=False)
+    return path
+
+# ----------------------
+# TIMING & MEMORY
+# ----------------------
+def run_stage(func, track_memory, *args):
+    """
+    Run a single pipeline stage and return (result, seconds, peak_bytes).
+    peak_bytes is the peak traced allocation during the stage, or None
+    when memory tracking is disabled.
+    """
+    gc.collect()
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+    peak_bytes = None
+    if track_memory:
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, seconds, peak_bytes
+
+def run_pipeline(input_path, output_path, track_memory):
+    """
+    Run the preprocessing pipeline once. Returns ({stage: (seconds,
+    peak_bytes)}, number of output rows).
+    """
+    timings = {}
+
+    def record(name, func, *args):
+        result, seconds, peak_bytes = run_stage(func, track_memory, *args)
+        timings[name] = (seconds, peak_bytes)
+        return result
+
+    df = record("read_csv", preprocess.read_data, input_path)
+    for name, func in preprocess.TRANSFORM_STAGES:
+        df = record(name, func, df)
+    record("to_csv", preprocess.write_data, df, output_path)
+    return timings, len(df)
+
+def benchmark_pipeline(input_path, output_path, num_rows, track_memory=True, repeat=DEFAULT_REPEAT):
+    """
+    Run the pipeline on input_path once as an unrecorded warm-up (page
+    cache, imports, allocator), then `repeat` more times, recording the
+    min and median wall time per stage. Timed runs never use tracemalloc,
+    whose overhead skews stages unevenly; peak memory comes from one
+    separate traced run.
+    """
+    run_pipeline(input_path, output_path, track_memory=False)
+    runs = [run_pipeline(input_path, output_path, track_memory=False) for _ in range(repeat)]
+    traced = run_pipeline(input_path, output_path, track_memory=True)[0] if track_memory else None
+
+    stages = {}
+    for name in runs[0][0]:
+        seconds = [timings[name][0] for timings, _ in runs]
+        peak_bytes = traced[name][1] if track_memory else None
+        stages[name] = {
+            "min_seconds": round(min(seconds), 6),
+            "median_seconds": round(statistics.median(seconds), 6),
+            "runs": [round(s, 6) for s in seconds],
+            "peak_bytes": peak_bytes,
+        }
+        print(f"   - {name}: min {min(seconds):.3f}s, median {statistics.median(seconds):.3f}s"
+              + (f", peak {peak_bytes / 1e6:.1f} MB" if track_memory else ""))
+
+    return {
+        "rows": num_rows,
+        "output_rows": runs[0][1],
+        "repeat": repeat,
+        "median_total_seconds": round(sum(s["median_seconds"] for s in stages.values()), 6),
+        "stages": stages,
+    }
+
+# ----------------------
+# RESULTS
+# ----------------------
+def get_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).decode("utf-8").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare_results(current, baseline):
+    """
+    Print per-stage median time ratios (current / baseline) for every row
+    count present in both result files. Returns False when nothing could
+    be compared, including baselines whose timings were taken under
+    tracemalloc (reports without "timings_traced": false).
+    """
+    print(f"\n📊 Comparing against baseline commit {baseline.get('commit')}")
+    if baseline.get("timings_traced", True):
+        print("⚠️ Baseline timings were recorded under tracemalloc and are not comparable. "
+              "Re-run the baseline commit with this version of the benchmark.")
+        return False
+
+    compared = False
+    baseline_runs = {run["rows"]: run for run in baseline["results"]}
+    for run in current["results"]:
+        base = baseline_runs.get(run["rows"])
+        if base is None:
+            continue
+        print(f"{run['rows']:,} rows:")
+        for name, stage in run["stages"].items():
+            base_stage = base["stages"].get(name)
+            if not base_stage or not base_stage.get("median_seconds"):
+                continue
+            compared = True
+            ratio = stage["median_seconds"] / base_stage["median_seconds"]
+            print(f"   - {name}: {base_stage['median_seconds']:.3f}s -> {stage['median_seconds']:.3f}s "
+                  f"({ratio:.2f}x, min {base_stage['min_seconds']:.3f}s -> {stage['min_seconds']:.3f}s)")
+    if not compared:
+        print("⚠️ No row counts or stages in common with the baseline.")
+    return compared
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark scripts/preprocess.py on synthetic housing data.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Row counts to generate and benchmark.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT,
+                        help="Where to write the JSON results.")
+    parser.add_argument("--baseline",
+                        help="JSON results from a previous run to compare against.")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="Timed runs per size after one warm-up run; min and median are recorded.")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip the extra tracemalloc run used to measure peak memory per stage.")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if args.repeat < 1:
+        raise ValueError("--repeat must be at least 1")
+    track_memory = not args.no_memory
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for num_rows in args.sizes:
+            print(f"🏗️ Generating {num_rows:,} synthetic rows...")
+            input_path = write_raw_data(num_rows, tmp_dir)
+            output_path = os.path.join(tmp_dir, f"sampled_{num_rows}.csv")
+
+            print(f"⏱️ Running pipeline on {num_rows:,} rows...")
+            results.append(benchmark_pipeline(input_path, output_path, num_rows, track_memory, args.repeat))
+            os.remove(input_path)
+
+    report = {
+        "commit": get_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "memory_tracked": track_memory,
+        "timings_traced": False,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Benchmark results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            if not compare_results(report, json.load(f)):
+                sys.exit(1)
+
+if __name__ == "__main__":
+    main()
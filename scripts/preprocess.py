@@ -6,49 +6,104 @@ INPUT_CSV = "data/raw_housing_data.csv"  # Input dataset
 OUTPUT_CSV = "data/sampled_data.csv"     # Processed dataset
 NUM_ROWS = 10000
 
-def main():
-    print("📂 Reading large CSV file...")
-    df = pd.read_csv(INPUT_CSV)
+COLUMNS = ["price", "bed", "bath", "acre_lot", "house_size"]
+BINS = [0, 1, 2, 3, 4, 5, 10, 20]
+BIN_LABELS = [1, 2, 3, 4, 5, 6, 7]
 
-    print("🔍 Selecting relevant columns...")
-    df = df[["price", "bed", "bath", "acre_lot", "house_size"]]
+# ----------------------
+# PIPELINE STAGES
+# ----------------------
+# Each stage takes and returns a DataFrame so the benchmark suite
+# (scripts/benchmark_preprocess.py) can time them individually.
+def read_data(path=INPUT_CSV):
+    return pd.read_csv(path)
 
-    df.dropna(inplace=True)
+def select_columns(df):
+    df = df[COLUMNS]
+    return df.dropna()
 
+def filter_price_outliers(df):
     # Remove outliers in price (top 1% of most expensive houses)
     upper_limit = df["price"].quantile(0.99)
-    df = df[df["price"] < upper_limit]
+    return df[df["price"] < upper_limit]
+
+def log_price(df):
+    df["price"] = np.log1p(df["price"])
+    return df
+
+def filter_acre_lot_outliers(df):
+    return df[df["acre_lot"] < df["acre_lot"].quantile(0.99)]
+
+def filter_house_size_outliers(df):
+    return df[df["house_size"] < df["house_size"].quantile(0.99)]
+
+def log_acre_lot(df):
+    df["acre_lot"] = np.log1p(df["acre_lot"])
+    return df
+
+def scale_house_size(df):
+    scaler = MinMaxScaler()
+    df[["house_size"]] = scaler.fit_transform(df[["house_size"]])
+    return df
+
+def bin_bed_bath(df):
+    # Convert bed & bath to categorical bins, then back to numeric values
+    df["bed"] = pd.cut(df["bed"], bins=BINS, labels=BIN_LABELS).astype(float)
+    df["bath"] = pd.cut(df["bath"], bins=BINS, labels=BIN_LABELS).astype(float)
+    return df
+
+def sample_rows(df, num_rows=NUM_ROWS):
+    return df.sample(n=min(num_rows, len(df)), random_state=42)
+
+def write_data(df, path=OUTPUT_CSV):
+    df.to_csv(path, index=False)
+    return df
+
+# Stages between read_data and write_data, in pipeline order
+TRANSFORM_STAGES = [
+    ("select_columns", select_columns),
+    ("filter_price_outliers", filter_price_outliers),
+    ("log_price", log_price),
+    ("filter_acre_lot_outliers", filter_acre_lot_outliers),
+    ("filter_house_size_outliers", filter_house_size_outliers),
+    ("log_acre_lot", log_acre_lot),
+    ("scale_house_size", scale_house_size),
+    ("bin_bed_bath", bin_bed_bath),
+    ("sample_rows", sample_rows),
+]
+
+def main():
+    print("📂 Reading large CSV file...")
+    df = read_data(INPUT_CSV)
+
+    print("🔍 Selecting relevant columns...")
+    df = select_columns(df)
+
+    df = filter_price_outliers(df)
 
     print("🛠️ Applying log transformation to price...")
-    df["price"] = np.log1p(df["price"]) 
+    df = log_price(df)
 
     # Remove outliers in acre_lot and house_size (top 1%)
-    df = df[df["acre_lot"] < df["acre_lot"].quantile(0.99)]
-    df = df[df["house_size"] < df["house_size"].quantile(0.99)]
+    df = filter_acre_lot_outliers(df)
+    df = filter_house_size_outliers(df)
 
-    df["acre_lot"] = np.log1p(df["acre_lot"])
+    df = log_acre_lot(df)
 
     # Normalize house_size
     print("📏 Normalizing house_size...")
-    scaler = MinMaxScaler()
-    df[["house_size"]] = scaler.fit_transform(df[["house_size"]])
+    df = scale_house_size(df)
     print(f"House Size after scaling: min={df['house_size'].min()}, max={df['house_size'].max()}")
 
-    # Convert bed & bath to categorical bins
     print("🏠 Binning bed and bath features...")
-    df["bed"] = pd.cut(df["bed"], bins=[0, 1, 2, 3, 4, 5, 10, 20], labels=[1, 2, 3, 4, 5, 6, 7])
-    df["bath"] = pd.cut(df["bath"], bins=[0, 1, 2, 3, 4, 5, 10, 20], labels=[1, 2, 3, 4, 5, 6, 7])
-
-    # Convert categorical bins to numeric values
-    df["bed"] = df["bed"].astype(float)
-    df["bath"] = df["bath"].astype(float)
+    df = bin_bed_bath(df)
 
     # Randomly sample data
     print(f"📊 Sampling {NUM_ROWS} rows out of {len(df)} total...")
-    df_sampled = df.sample(n=min(NUM_ROWS, len(df)), random_state=42)
+    df_sampled = sample_rows(df, NUM_ROWS)
 
     # Save cleaned dataset
-    df_sampled.to_csv(OUTPUT_CSV, index=False)
+    write_data(df_sampled, OUTPUT_CSV)
     print(f"✅ Processed data saved to {OUTPUT_CSV}")
 
 if __name__ == "__main__":